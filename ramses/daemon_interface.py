@@ -17,7 +17,7 @@
 #
 #======================= END GPL LICENSE BLOCK ========================
 
-import socket, json
+import socket, json, time
 
 from .logger import log
 from .constants import ItemType, LogLevel, Log, StepType
@@ -34,6 +34,10 @@ class RamDaemonInterface( object ):
     
     _instance = None
 
+    # The ping reply is kept for a short time, it's used to check the user before each query
+    __pingReply = None
+    __pingTime = 0
+
     @staticmethod
     def checkReply( obj ):
         if obj['accepted'] and obj['success'] and obj['content'] is not None:
@@ -70,7 +74,22 @@ class RamDaemonInterface( object ):
         Returns: dict.
             Read http://ramses.rxlab.guide/dev/daemon-reference/ for more information.
         """
-        return self.__post('ping', 65536)
+        reply = self.__post('ping', 65536)
+        # Only keep a valid reply, a failure has to be checked again
+        if reply is not None and reply.get('accepted', False) and reply.get('success', False):
+            self.__pingReply = reply
+            self.__pingTime = time.time()
+        else:
+            self.__pingReply = None
+        return reply
+
+    def _clearPing(self):
+        """Low-level, undocumented. Forgets the latest ping reply, the next query will ping the daemon again.
+
+        Returns: None
+        """
+        self.__pingReply = None
+        self.__pingTime = 0
 
     def raiseWindow(self):
         """Raises the Ramses Client application main window.
@@ -566,6 +585,7 @@ class RamDaemonInterface( object ):
         except Exception as e: #pylint: disable=broad-except
             log("Daemon can't be reached", LogLevel.Debug)
             log(str(e), LogLevel.Critical)
+            self.__pingReply = None
             ramses = Ramses.instance()
             ramses.disconnect()
             return
@@ -597,10 +617,18 @@ class RamDaemonInterface( object ):
 
         return obj
 
+    def __cachedPing(self):
+        """Returns the latest ping reply if it's recent enough, otherwise pings the daemon again.
+        There's a 2-second timeout, the same as the data of the objects,
+        as all queries check the user first"""
+        if self.__pingReply is not None and time.time() - self.__pingTime < 2:
+            return self.__pingReply
+        return self.ping()
+
     def __testConnection(self):
         """Checks if the Ramses Daemon is available"""
 
-        data = self.ping()
+        data = self.__cachedPing()
 
         if data is None:
             log("Daemon unavailable", LogLevel.Debug)
@@ -619,7 +647,7 @@ class RamDaemonInterface( object ):
         return False
 
     def __checkUser(self):
-        data = self.ping()
+        data = self.__cachedPing()
 
         if data is None:
             return False
@@ -19,6 +19,7 @@
 
 import os, re
 from datetime import datetime
+from functools import lru_cache
 from .constants import ItemType, LogLevel
 from .utils import intToStr
 from .ram_settings import RamSettings
@@ -27,9 +28,30 @@ from .logger import log
 # Keep the settings at hand
 settings = RamSettings.instance()
 
+# The tag added to the resource of the restored versions
+RE_RESTORED_TAG = re.compile( '\\+restored-v(\\d+)\\+' )
+
 class RamFileInfo():
     """A class to help generating filenames or getting data from filenames"""
 
+    # Lots of these are created when scanning folders; slots make them lighter and faster to fill
+    __slots__ = (
+        'project',
+        'ramType',
+        'shortName',
+        'step',
+        'resource',
+        'state',
+        'version',
+        'extension',
+        'isRestoredVersion',
+        'restoredVersion',
+        'date',
+        '__stateShortNames',
+        '__fileName',
+        '__filePath'
+        )
+
     # Cache stuff
     __nameRe = None # The regexp to handle names. Initialized the first time it's needed
 
@@ -57,6 +79,13 @@ class RamFileInfo():
         self.restoredVersion = -1
         self.date = datetime.now()
 
+    @classmethod
+    def invalidateRegExCache( cls ):
+        """Forgets the regex used to parse names, and all the names already parsed.
+        Must be called when the states or the version prefixes change, the regex will be rebuilt the next time it's needed."""
+        cls.__nameRe = None
+        cls.__decomposeFileName.cache_clear()
+
     def __getRamsesNameRegEx( self ):
         """Private method to get a Regex to check if a file matches Ramses' naming convention."""
 
@@ -65,7 +94,10 @@ class RamFileInfo():
 
         regexStr = self.___getVersionRegExStr()
 
-        regexStr = '^([a-z0-9+-]{1,10})_(?:([ASG])_((?!(?:' + regexStr + ')[0-9]+)[a-z0-9+-]{1,10}))(?:_((?!(?:' + regexStr + ')[0-9]+)[a-z0-9+-]+))?(?:_((?!(?:' + regexStr + ')[0-9]+)[a-z0-9+\\s-]+))?(?:_(' + regexStr + ')?([0-9]+))?(?:\\.([a-z0-9.]+))?$'
+        # A block can't be a version block; the lookahead only needs to see the first digit after the prefix
+        notVersion = '(?!(?:' + regexStr + ')[0-9])'
+
+        regexStr = '^([a-z0-9+-]{1,10})_([ASG])_(' + notVersion + '[a-z0-9+-]{1,10})(?:_(' + notVersion + '[a-z0-9+-]+))?(?:_(' + notVersion + '[a-z0-9+\\s-]+))?(?:_(' + regexStr + ')?([0-9]+))?(?:\\.([a-z0-9.]+))?$'
 
         log("Here's my regex for the names:\n" + regexStr, LogLevel.Debug)
 
@@ -86,12 +118,15 @@ class RamFileInfo():
         ramses = Ramses.instance()
 
         if len( self.__stateShortNames ) == 0:
-            self.__stateShortNames = settings.versionPrefixes
+            # Copy the prefixes, we don't want to add the states to the settings
+            stateShortNames = list( settings.versionPrefixes )
             states = ramses.states()
             for state in states:
-                self.__stateShortNames.append( state.shortName() )
+                stateShortNames.append( state.shortName() )
+            self.__stateShortNames = stateShortNames
 
-        return '|'.join( self.__stateShortNames )
+        # Short names are not regexes, they may contain '+' for example
+        return '|'.join( [ re.escape( n ) for n in self.__stateShortNames ] )
 
     def originalFilePath( self ):
         """Gets the original filepath if it was set"""
@@ -153,61 +188,131 @@ class RamFileInfo():
         """Sets the filename and parses data from it. Returns boolean for success"""
         self.__init()
 
+        # Accept path-like objects, like pathlib paths or os.scandir entries, and bytes
+        if not isinstance( name, str ):
+            try:
+                name = os.path.basename( os.fsdecode( name ) )
+            except TypeError:
+                return False
+
         self.__fileName = name
 
-        splitRamsesName = re.match(self.__getRamsesNameRegEx(), name)
+        decomposedName = RamFileInfo.__decomposeFileName( self.__getRamsesNameRegEx(), name )
 
-        if splitRamsesName is None:
+        if decomposedName is None:
             return False
 
-        self.project = splitRamsesName.group(1)
-        self.ramType = splitRamsesName.group(2)
+        (
+            self.project,
+            self.ramType,
+            self.shortName,
+            self.step,
+            self.resource,
+            self.state,
+            self.version,
+            self.extension,
+            self.isRestoredVersion,
+            self.restoredVersion
+        ) = decomposedName
+
+        return True
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def __decomposeFileName( nameRe, name ):
+        """Private method to parse a file name with the given regex.
+        The result only depends on the name, so it's cached: the same names are parsed again and again when scanning folders.
+        The cached tuples are immutable, they can be shared by the threads scanning several folders.
+
+        Returns: tuple (project, ramType, shortName, step, resource, state, version, extension, isRestoredVersion, restoredVersion) or None"""
+
+        # Quick rejection of the other files without running the regex:
+        # a Ramses name always starts with "project_type_"
+        blocks = name.split( '_', 2 )
+        if len( blocks ) < 3 or blocks[1].upper() not in ( ItemType.ASSET, ItemType.SHOT, ItemType.GENERAL ):
+            return None
+
+        splitRamsesName = nameRe.match( name )
 
-        if self.ramType in (ItemType.ASSET, ItemType.SHOT):
-            self.shortName = splitRamsesName.group(3)
+        if splitRamsesName is None:
+            return None
+
+        project = splitRamsesName.group(1)
+        ramType = splitRamsesName.group(2)
+        shortName = ""
+        step = ""
+        resource = ""
+        state = ""
+        version = -1
+        extension = ""
+        isRestoredVersion = False
+        restoredVersion = -1
+
+        if ramType in (ItemType.ASSET, ItemType.SHOT):
+            shortName = splitRamsesName.group(3)
             if splitRamsesName.group(4) is not None:
-                self.step = splitRamsesName.group(4)
+                step = splitRamsesName.group(4)
         else:
-            self.step = splitRamsesName.group(3)
+            step = splitRamsesName.group(3)
             if splitRamsesName.group(4) is not None:
-                self.shortName = splitRamsesName.group(4)
+                shortName = splitRamsesName.group(4)
 
         if splitRamsesName.group(5) is not None:
-            self.resource = splitRamsesName.group(5)
-            restoredInfo = re.match( '\\+restored-v(\\d+)\\+', self.resource)
-            if restoredInfo:
-                self.isRestoredVersion = True
-                self.restoredVersion = int( restoredInfo.group(1) )
-                self.resource = re.sub( '\\+restored-v\\d+\\+', "", self.resource)
+            resource = splitRamsesName.group(5)
+            # Most resources don't have the tag, don't run the regex for them
+            if '+restored-v' in resource:
+                restoredInfo = RE_RESTORED_TAG.match( resource )
+                if restoredInfo:
+                    isRestoredVersion = True
+                    restoredVersion = int( restoredInfo.group(1) )
+                    resource = RE_RESTORED_TAG.sub( "", resource )
 
         if splitRamsesName.group(6) is not None:
-            self.state = splitRamsesName.group(6)
+            state = splitRamsesName.group(6)
 
         if splitRamsesName.group(7) is not None:
-            self.version = int ( splitRamsesName.group(7) )
+            version = int ( splitRamsesName.group(7) )
 
         if splitRamsesName.group(8) is not None:
-            self.extension = splitRamsesName.group(8)
-
-        return True
+            extension = splitRamsesName.group(8)
+
+        return (
+            project,
+            ramType,
+            shortName,
+            step,
+            resource,
+            state,
+            version,
+            extension,
+            isRestoredVersion,
+            restoredVersion
+        )
 
     def setFilePath( self, path ):
         """Tries to get the maximum information from the path"""
         from .file_manager import RamFileManager
 
+        # Accept path-like objects, like pathlib paths or os.scandir entries, and bytes
+        if not isinstance( path, str ):
+            path = os.fsdecode( path )
+
         self.__filePath = path
 
         originalPath = path
-        name = os.path.basename( path )
+        # Split once per level when walking up the tree, instead of calling dirname() and basename()
+        parentPath, name = os.path.split( path )
 
         # First get information specific to files or innest folder, won't be found in parent folders:
         self.setFileName( name )
 
-        # The date of the file
-        if os.path.exists( path ):
+        # The date of the file; just try to get it, checking if the file exists first would stat it twice
+        try:
             self.date = datetime.fromtimestamp(
                 os.path.getmtime( path )
             )
+        except OSError:
+            pass
 
         # If this is a project path, let's just use the project short name
         if RamFileManager.isProjectFolder( path):
@@ -215,8 +320,8 @@ class RamFileInfo():
             return
 
         # Move up to the parent folder
-        path = os.path.dirname(path)
-        name = os.path.basename(path)
+        path = parentPath
+        parentPath, name = os.path.split( path )
 
         # Move up the tree until we've found something which can be decomposed
         while name != '':
@@ -244,9 +349,9 @@ class RamFileInfo():
                 return
 
             # Move up to the parent folder
-            path = os.path.dirname(path)
-            name = os.path.basename(path)
-        
+            path = parentPath
+            parentPath, name = os.path.split( path )
+
         # We really need to find the project. If not found, try to decompose names in files inside the given path
         if self.project == '':
             if os.path.isfile(originalPath):
@@ -267,6 +372,19 @@ class RamFileInfo():
                 self.project = nm.project
                 break
 
+    def setFolderPath( self, folderPath ):
+        """Moves the file to another folder, keeping all the information already parsed"""
+        from .file_manager import RamFileManager
+
+        fileName = self.__fileName
+        if fileName == "":
+            fileName = self.fileName()
+
+        self.__filePath = RamFileManager.buildPath((
+            folderPath,
+            fileName
+        ))
+
     def copy( self ):
         """Returns a copy of the current instance"""
 
@@ -17,8 +17,11 @@
 #
 #======================= END GPL LICENSE BLOCK ========================
 
-import os, re, shutil, codecs
+import os, re, shutil, codecs, time
+from datetime import datetime
+from functools import lru_cache
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 from .ram_settings import RamSettings
 from .utils import intToStr
 from .logger import log
@@ -28,25 +31,90 @@ from .file_info import RamFileInfo
 # Keep the settings at hand
 settings = RamSettings.instance()
 
+# Compiled once, these are used when scanning folders
+RE_ITEM_FOLDER = re.compile('^([a-z0-9+-]{1,10})_([ASG])_([a-z0-9+-]{1,10})$', re.IGNORECASE)
+RE_NAME = re.compile('^[ a-zA-Z0-9+-]{1,256}$', re.IGNORECASE)
+RE_SHORTNAME = re.compile('^[a-z0-9+-]{1,10}$', re.IGNORECASE)
+
+# The names of the reserved subfolders, these are not settings to be customized (yet)
+VERSIONS_FOLDER = settings.folderNames.versions
+PUBLISH_FOLDER = settings.folderNames.publish
+PREVIEW_FOLDER = settings.folderNames.preview
+RESERVED_FOLDERS = frozenset(( VERSIONS_FOLDER, PUBLISH_FOLDER, PREVIEW_FOLDER ))
+
+# How long isProjectFolder results are kept, in seconds
+PROJECT_FOLDERS_TIMEOUT = 10
+
+# How long the parsed folder listings are kept, in seconds
+FOLDER_LISTINGS_TIMEOUT = 2
+
+# The subfolders which identify a project root folder
+PROJECT_FOLDERS = frozenset((
+    FolderNames.admin,
+    FolderNames.preProd,
+    FolderNames.prod,
+    FolderNames.postProd,
+    FolderNames.assets,
+    FolderNames.shots,
+    FolderNames.export
+))
+
 class RamFileManager():
     """A Class to help managing files using the Ramses naming scheme"""
 
     # Cache stuff
     __writingThreads = []
+    # isProjectFolder results: { folderPath: (bool, time) }
+    # Also used by the threads of _mapInThreads(): entries are only read and set as whole tuples, never modified
+    __projectFolders = {}
+    # _listRamsesFiles results: { folderPath: (list, time) }
+    # Used by the threads in the same way, entries are only read, set or removed as whole tuples
+    __folderListings = {}
+    __resourceTranslation = str.maketrans({ # Forbidden characters in resources and their replacement
+        '"' : ' ',
+        '_' : '-',
+        '[' : '-',
+        ']' : '-',
+        '{' : '-',
+        '}' : '-',
+        '(' : '-',
+        ')' : '-',
+        '\'': ' ',
+        '`' : ' ',
+        '.' : '-',
+        '/' : '-',
+        '\\' : '-',
+        ',' : ' '
+        })
 
     @staticmethod
-    def copy( originPath, destinationPath, separateThread=True ):
-        """Copies a file, in a separated thread if separateThread is True"""
+    def copy( originPath, destinationPath, separateThread=True, copyMetadata=True ):
+        """Copies a file, in a separated thread if separateThread is True.
+        If copyMetadata is False, only the content is copied, and the new file gets the current date"""
         if separateThread:
-            t = Thread( target=RamFileManager.copy, args=(originPath, destinationPath, False) )
+            t = Thread( target=RamFileManager.copy, args=(originPath, destinationPath, False, copyMetadata) )
             log( "Launching parallel copy of a file.", LogLevel.Debug )
             t.start()
             RamFileManager.__writingThreads.append(t)
         else:
             log("Starting copy of: " + os.path.basename( originPath ) + "\nto: " + destinationPath, LogLevel.Debug )
-            shutil.copy2( originPath, destinationPath )
+            shutil.copyfile( originPath, destinationPath )
+            if copyMetadata:
+                RamFileManager._copyDates( originPath, destinationPath )
+            RamFileManager._forgetListing( os.path.dirname( destinationPath ) )
             log("Finished writing: " + os.path.basename( destinationPath ), LogLevel.Debug )
 
+    @staticmethod
+    def _copyDates( originPath, destinationPath ):
+        """Low-level, undocumented. Copies the dates and permissions of a file to another one.
+        Faster than shutil.copystat which also copies the extended attributes and flags we don't need.
+
+        Returns: None
+        """
+        st = os.stat( originPath )
+        os.utime( destinationPath, ns=( st.st_atime_ns, st.st_mtime_ns ) )
+        os.chmod( destinationPath, st.st_mode & 0o7777 )
+
     @staticmethod
     def waitFiles():
         """Waits for all writing operations to finish"""
@@ -57,19 +125,15 @@ class RamFileManager():
     def getRamsesFiles( folderPath, resource = None ):
         """Gets all files respecting the Ramses naming scheme in the given folder
         Returns a list of file paths"""
-        if not os.path.isdir(folderPath):
-            return []
-
         files = []
 
-        for f in os.listdir(folderPath):
-            nm = RamFileInfo()
-            if nm.setFileName(f):
-                if resource is None or nm.resource == resource:
-                    files.append( RamFileManager.buildPath((
-                        folderPath,
-                        f
-                    )))
+        # The listing is shared with the other scans of the same folder, and empty if the folder doesn't exist
+        for f, nm in RamFileManager._listRamsesFiles( folderPath ):
+            if resource is None or nm.resource == resource:
+                files.append( RamFileManager.buildPath((
+                    folderPath,
+                    f
+                )))
 
         return files
 
@@ -79,22 +143,12 @@ class RamFileManager():
         # Try to find the type from shots or assets folders
         if os.path.isdir( assetsPath ):
             # each folder is an asset group
-            for folder in os.listdir( assetsPath ):
-                groupPath = assetsPath + "/" + folder 
-                # Check only dirs
-                if not os.path.isdir( groupPath ):
-                    continue
+            for groupFolder in RamFileManager._iterSubFolders( assetsPath ):
                 # each folder is an asset
-                for assetFolder in os.listdir( groupPath ):
-                    assetPath = groupPath + '/' + assetFolder
-                    if not os.path.isdir( assetPath ):
-                        continue
+                for assetFolder in RamFileManager._iterSubFolders( groupFolder.path ):
                     # each folder is a step working folder in the asset
-                    for stepFolder in os.listdir( assetPath ):
-                        nm = RamFileInfo()
-                        if nm.setFileName( stepFolder ):
-                            if nm.step == stepShortName:
-                                return True
+                    if RamFileManager._containsStepFolder( assetFolder.path, stepShortName ):
+                        return True
         return False
 
     @staticmethod
@@ -102,56 +156,81 @@ class RamFileManager():
         """Checks the production type of the given step in the shots folder"""
         if os.path.isdir( shotsPath ):
             #  each folder is a shot
-            for shotFolder in os.listdir( shotsPath ):
-                shotPath = shotsPath + '/' + shotFolder
-                if not os.path.isdir( shotPath ):
-                    continue
+            for shotFolder in RamFileManager._iterSubFolders( shotsPath ):
                 # each folder is a step working folder in the shot
-                for shotFolder in os.listdir( shotPath ):
-                    nm = RamFileInfo()
-                    if nm.setFileName( shotFolder ):
-                        if nm.step == shotShortName:
-                            return True
+                if RamFileManager._containsStepFolder( shotFolder.path, shotShortName ):
+                    return True
+        return False
+
+    @staticmethod
+    def _iterSubFolders( folderPath ):
+        """Low-level, undocumented. Iterates over the subfolders of the given folder.
+
+        Yields: os.DirEntry
+        """
+        with os.scandir( folderPath ) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    yield entry
+
+    @staticmethod
+    def _containsStepFolder( folderPath, stepShortName ):
+        """Low-level, undocumented. Checks if a name in the folder is the one of a working folder of the given step.
+
+        Returns: bool
+        """
+        with os.scandir( folderPath ) as entries:
+            for entry in entries:
+                nm = RamFileInfo()
+                if nm.setFileName( entry.name ) and nm.step == stepShortName:
+                    return True
         return False
 
     @staticmethod
     def getProjectFolder( path ):
         """Tries to get the root folder of the project"""
 
-        name = os.path.basename( path )
+        parentPath, name = os.path.split( path )
 
         while name != '':
             if RamFileManager.isProjectFolder( path ):
                 return path
             # Move up to the parent folder
-            path = os.path.dirname(path)
-            name = os.path.basename(path)
-        
+            path = parentPath
+            parentPath, name = os.path.split( path )
+
         return ''
 
     @staticmethod
     def isProjectFolder( folderPath ):
         """Checks if the given folder is the project root"""
-        if not os.path.isdir( folderPath ):
-            return False
 
-        foundFiles = os.listdir( folderPath )
-        for foundFile in foundFiles:
-            if os.path.isfile(foundFile):
-                continue
-            folderName = os.path.basename( foundFile )
-            if folderName in (
-                    '00-ADMIN',
-                    '01-PRE-PROD',
-                    '02-PROD',
-                    '03-POST-PROD',
-                    '04-ASSETS',
-                    '05-SHOTS',
-                    '06-EXPORT'
-                ):
-                return True
+        # The same folders are checked again and again when walking up the tree from files of the same project;
+        # there's a short timeout as folders may be created or removed
+        cachedResult = RamFileManager.__projectFolders.get( folderPath )
+        if cachedResult is not None and time.time() - cachedResult[1] < PROJECT_FOLDERS_TIMEOUT:
+            return cachedResult[0]
 
-        return False
+        isProject = False
+        if os.path.isdir( folderPath ):
+            with os.scandir( folderPath ) as foundFiles:
+                for foundFile in foundFiles:
+                    # Check the name first, it's cheaper than the type
+                    if foundFile.name in PROJECT_FOLDERS and foundFile.is_dir():
+                        isProject = True
+                        break
+
+        if len( RamFileManager.__projectFolders ) > 4096:
+            RamFileManager.__projectFolders.clear()
+        RamFileManager.__projectFolders[folderPath] = ( isProject, time.time() )
+
+        return isProject
+
+    @staticmethod
+    def clearProjectFoldersCache():
+        """Forgets which folders are project folders.
+        Call this after creating or removing projects on the disk, to check them again without waiting for the cache timeout"""
+        RamFileManager.__projectFolders.clear()
 
     @staticmethod
     def getSaveFilePath( path ):
@@ -160,6 +239,15 @@ class RamFileManager():
 
         nm = RamFileInfo()
         nm.setFilePath( path )
+        return RamFileManager._getSaveFilePath( path, nm )
+
+    @staticmethod
+    def _getSaveFilePath( path, nm ):
+        """Low-level, undocumented. Gets the save path for an existing file,
+        using the RamFileInfo already set with this path to not walk up the tree again.
+
+        Returns: str
+        """
         if nm.project == '':
             return ""
 
@@ -175,16 +263,14 @@ class RamFileManager():
             return ""
 
         # Get up the tree until we find a reserved folder and get out of it!
-        path = os.path.dirname(saveFolder)
-        name = os.path.basename(path)
+        parentFolder, name = os.path.split( os.path.dirname(saveFolder) )
         while name != '':
             # Found it!
-            if RamFileManager.isReservedFolder( path ):
-                saveFolder = os.path.dirname( path )
+            if name in RESERVED_FOLDERS:
+                saveFolder = parentFolder
                 break
             # Move up to the parent folder
-            path = os.path.dirname(path)
-            name = os.path.basename(path)
+            parentFolder, name = os.path.split( parentFolder )
 
         saveFileName = nm.fileName()
 
@@ -199,7 +285,7 @@ class RamFileManager():
 
         from .metadata_manager import RamMetaDataManager
 
-        fileName = os.path.basename( filePath )
+        versionFolder, fileName = os.path.split( filePath )
 
         nm = RamFileInfo()
         if not nm.setFileName( fileName ):
@@ -212,7 +298,6 @@ class RamFileManager():
         nm.version = -1
         restoredFileName = nm.fileName()
 
-        versionFolder = os.path.dirname( filePath )
         saveFolder = os.path.dirname( versionFolder )
 
         restoredFilePath = saveFolder + '/' + restoredFileName
@@ -261,32 +346,28 @@ class RamFileManager():
         # version number
         if (versionInfo.version <= 0): versionFolder = versionFolder + intToStr( 1 )
         else: versionFolder = versionFolder + intToStr( versionInfo.version )
-        # State
-        if versionInfo.state != "" and versionInfo.state.lower() != "v":
+        # State, not the default "v" prefix
+        hasState = versionInfo.state != "" and versionInfo.state.lower() != "v"
+        if hasState:
             versionFolder = versionFolder + "_" + versionInfo.state
 
         # The complete path
-        newFilePath = RamFileManager.buildPath ((
+        newFolderPath = RamFileManager.buildPath ((
             publishFolder,
             versionFolder
         ))
-        # make it if it does not exist yet
-        if not os.path.isdir( newFilePath ):
-            os.makedirs( newFilePath )
-
-        # add the fileName
-        newFilePath = RamFileManager.buildPath ((
-            newFilePath,
-            fileInfo.fileName()
-        ))
-
-        # store in a new info
-        publishedInfo = RamFileInfo()
-        publishedInfo.setFilePath( newFilePath )
+        # make it if it does not exist yet; checking first is a single stat when it exists,
+        # exist_ok keeps it safe if another thread creates it in between
+        if not os.path.isdir( newFolderPath ):
+            os.makedirs( newFolderPath, exist_ok=True )
+
+        # store in a new info, everything but the folder is already known
+        publishedInfo = fileInfo.copy()
+        publishedInfo.setFolderPath( newFolderPath )
         # Reset the date, version, etc
         publishedInfo.date = fileInfo.date
         publishedInfo.version = versionInfo.version
-        if versionInfo.state != "" and versionInfo.state.lower() != "v":
+        if hasState:
             publishedInfo.state = versionInfo.state
 
         return publishedInfo
@@ -297,10 +378,14 @@ class RamFileManager():
         folder = RamFileManager.getPublishFolder( filePath )
 
         folders = []
-        for f in os.listdir(folder):
-            folderPath = RamFileManager.buildPath(( folder, f ))
-            if not os.path.isdir(folderPath): continue
-            folders.append( folderPath )
+        try:
+            # The entries know their type, no need to stat each of them
+            with os.scandir( folder ) as entries:
+                for entry in entries:
+                    if not entry.is_dir(): continue
+                    folders.append( RamFileManager.buildPath(( folder, entry.name )) )
+        except ( FileNotFoundError, NotADirectoryError ):
+            pass
 
         return folders
 
@@ -309,51 +394,125 @@ class RamFileManager():
         """Copies and increments a file into the version folder
 
         Returns the filePath of the new file version"""
+        return RamFileManager.copyFilesToVersion( (filePath,), increment, stateShortName )[0]
+
+    @staticmethod
+    def copyFilesToVersion( filePaths, increment = False, stateShortName="" ):
+        """Copies and increments several files into their version folders.
+        Each versions folder is scanned only once, which is faster than calling copyToVersion for each file.
+
+        Returns the list of the filePaths of the new file versions (None for files which can't be versioned)"""
         from .metadata_manager import RamMetaDataManager
 
-        if not os.path.isfile( filePath ):
-            raise Exception( "Missing File: Cannot increment a file which does not exists: " + filePath )
+        for filePath in filePaths:
+            if not os.path.isfile( filePath ):
+                raise Exception( "Missing File: Cannot increment a file which does not exists: " + filePath )
 
-        log("Incrementing version for file: " + filePath, LogLevel.Debug)
+        newFilePaths = [ None ] * len( filePaths )
+        fileInfos = {}
+        # The files to version, for each versions folder
+        versionsFolders = {}
 
-        # Check File Name
-        fileInfo = RamFileInfo()
-        fileInfo.setFilePath( filePath )
-        if fileInfo.project == '':
-            log( Log.MalformedName, LogLevel.Critical )
-            return
+        for i, filePath in enumerate( filePaths ):
+            log("Incrementing version for file: " + filePath, LogLevel.Debug)
 
-        # Look for the latest version to increment and save
-        versioInfo = RamFileManager.getLatestVersionInfo( filePath, stateShortName )
+            # Check File Name
+            fileInfo = RamFileInfo()
+            fileInfo.setFilePath( filePath )
+            if fileInfo.project == '':
+                log( Log.MalformedName, LogLevel.Critical )
+                continue
+            fileInfos[i] = fileInfo
 
-        fileInfo.version = versioInfo.version
-        if stateShortName == "":
-            fileInfo.state = versioInfo.state
-        else:
-            fileInfo.state = stateShortName
+            versionsFolder = RamFileManager.getVersionFolder( filePath )
+            if versionsFolder in versionsFolders:
+                versionsFolders[versionsFolder].append( i )
+            else:
+                versionsFolders[versionsFolder] = [ i ]
 
-        if increment:
-            fileInfo.version += 1
+        for versionsFolder, fileIndices in versionsFolders.items():
 
-        if fileInfo.version <= 0:
-            fileInfo.version = 1
+            # Look for the latest versions to increment and save, for all the files at once
+            latestVersions = RamFileManager._getLatestVersions( versionsFolder )
 
-        newFileName = fileInfo.fileName()
+            for i in fileIndices:
+                filePath = filePaths[i]
+                fileInfo = fileInfos[i]
 
-        versionsFolder = RamFileManager.getVersionFolder( filePath )
+                # The versions are the ones with the same name (without resource and version)
+                nm = RamFileInfo()
+                if not nm.setFileName( os.path.basename( filePath ) ):
+                    log( Log.MalformedName, LogLevel.Critical )
+                    latestVersion = None
+                else:
+                    latestVersion = latestVersions.get(( nm.project, nm.ramType, nm.shortName, nm.step, nm.resource ))
+
+                if latestVersion is None:
+                    fileInfo.version = -1
+                    fileInfo.state = stateShortName
+                else:
+                    fileInfo.version = latestVersion[0]
+                    if stateShortName == "":
+                        fileInfo.state = latestVersion[1]
+                    else:
+                        fileInfo.state = stateShortName
+
+                if increment:
+                    fileInfo.version += 1
+
+                if fileInfo.version <= 0:
+                    fileInfo.version = 1
+
+                newFileName = fileInfo.fileName()
+
+                newFilePath = RamFileManager.buildPath(( versionsFolder, newFileName ))
+                # The date of the version is the date it's been created
+                RamFileManager.copy( filePath, newFilePath, copyMetadata=False )
+                RamMetaDataManager.appendHistoryDate( newFilePath )
+                newFilePaths[i] = newFilePath
 
-        newFilePath = RamFileManager.buildPath(( versionsFolder, newFileName ))
-        RamFileManager.copy( filePath, newFilePath )
-        RamMetaDataManager.appendHistoryDate( newFilePath )
-        return newFilePath
+        return newFilePaths
+
+    @staticmethod
+    def _getLatestVersions( versionsFolder ):
+        """Low-level, undocumented. Scans the versions folder once to get the latest version of all the files it contains.
+
+        Returns: dict { (project, ramType, shortName, step, resource): (version, state) }
+        """
+        latestVersions = {}
+
+        with os.scandir( versionsFolder ) as foundFiles:
+            for foundFile in foundFiles:
+                if not foundFile.is_file(): # This is in case the user has created folders in _versions
+                    continue
+
+                foundNM = RamFileInfo()
+                if not foundNM.setFileName( foundFile.name ):
+                    continue
+                if foundNM.version <= 0:
+                    continue
+
+                identity = ( foundNM.project, foundNM.ramType, foundNM.shortName, foundNM.step, foundNM.resource )
+                latestVersion = latestVersions.get( identity )
+                # The first one found wins if there are several files with the same version
+                if latestVersion is None or foundNM.version > latestVersion[0]:
+                    latestVersions[identity] = ( foundNM.version, foundNM.state )
+
+        return latestVersions
 
     @staticmethod
     def getLatestVersionInfo( filePath, defaultStateShortName="v", previous = False ):
         """Gets the RamFileInfo for the latest version file"""
 
-        latestVersionFilePath = RamFileManager.getLatestVersionFilePath( filePath, previous )
-        versionInfo = RamFileInfo()
-        versionInfo.setFilePath( latestVersionFilePath )
+        versionFile = RamFileManager._getLatestVersionFile( filePath, previous )
+        if versionFile is None:
+            versionInfo = RamFileInfo()
+        else:
+            # The name has already been parsed during the scan, just complete the info with the folder and the date
+            versionsFolder, foundFile, versionInfo = versionFile
+            versionInfo.setFolderPath( versionsFolder )
+            versionInfo.date = datetime.fromtimestamp( foundFile.stat().st_mtime )
+
         if versionInfo.state == '':
             versionInfo.state = defaultStateShortName
         return versionInfo
@@ -361,52 +520,43 @@ class RamFileManager():
     @staticmethod
     def getLatestVersionFilePath( filePath, previous=False ):
         """Gets the file path of the latest version"""
+        versionFile = RamFileManager._getLatestVersionFile( filePath, previous )
+        if versionFile is None:
+            return ''
+        return versionFile[0] + '/' + versionFile[1].name
+
+    @staticmethod
+    def _getLatestVersionFile( filePath, previous=False ):
+        """Low-level, undocumented. Looks for the latest version of the file (or the previous one).
+
+        Returns: tuple (versionsFolder, os.DirEntry, RamFileInfo) or None if there's no version
+        """
         # Check File Name
         fileName = os.path.basename( filePath )
         nm = RamFileInfo()
         if not nm.setFileName( fileName ):
             log( Log.MalformedName, LogLevel.Critical )
-            return ''
+            return None
 
         # Get versions
         versionsFolder = RamFileManager.getVersionFolder( filePath )
 
-        foundFiles = os.listdir( versionsFolder )
-        highestVersion = 0
-
-        versionFilePath = ''
-        prevVersionFilePath = ''
-
-        for foundFile in foundFiles:
-            if not os.path.isfile( versionsFolder + '/' + foundFile ): # This is in case the user has created folders in _versions
-                continue
-
-            foundNM = RamFileInfo()
-            if not foundNM.setFileName( foundFile ):
-                continue
-            if foundNM.project != nm.project:
-                continue
-            if foundNM.ramType != nm.ramType:
-                continue
-            if foundNM.shortName != nm.shortName:
-                continue
-            if foundNM.step != nm.step:
-                continue
-            if foundNM.resource != nm.resource:
-                continue
-            if foundNM.version == -1:
-                continue
+        # Only actual versions, not the files without version number
+        versionFiles = [ f for f in RamFileManager._iterVersionFiles( versionsFolder, nm ) if f[0] > 0 ]
+        if len( versionFiles ) == 0:
+            return None
 
-            version = foundNM.version
-            if version > highestVersion:
-                highestVersion = version
-                prevVersionFilePath = versionFilePath
-                versionFilePath = versionsFolder + '/' + foundFile
+        # The first one found wins if there are several files with the same version
+        versionFile = max( versionFiles, key=RamFileManager._versionFileKey )
 
         if previous:
-            return prevVersionFilePath
+            # The highest version below the latest one
+            previousFiles = [ f for f in versionFiles if f[0] < versionFile[0] ]
+            if len( previousFiles ) == 0:
+                return None
+            versionFile = max( previousFiles, key=RamFileManager._versionFileKey )
 
-        return versionFilePath
+        return ( versionsFolder, versionFile[1], versionFile[2] )
 
     @staticmethod
     def getVersionFilePaths( filePath ):
@@ -419,52 +569,59 @@ class RamFileManager():
         # Get versions
         versionsFolder = RamFileManager.getVersionFolder( filePath )
 
-        foundFiles = os.listdir( versionsFolder )
-        versionFiles = []
+        # The versions are already parsed by the scan, sort them without parsing the names again
+        versionFiles = list( RamFileManager._iterVersionFiles( versionsFolder, nm ) )
+        versionFiles.sort( key = RamFileManager._versionFileKey )
+        return [ versionsFolder + '/' + f[1].name for f in versionFiles ]
 
-        for foundFile in foundFiles:
-            foundFilePath = versionsFolder + '/' + foundFile
-            if not os.path.isfile( foundFilePath ): # This is in case the user has created folders in _versions
-                continue
-            
-            foundNM = RamFileInfo()
-            if not foundNM.setFileName( foundFile ):
-                continue
-            if foundNM.project != nm.project:
-                continue
-            if foundNM.ramType != nm.ramType:
-                continue
-            if foundNM.shortName != nm.shortName:
-                continue
-            if foundNM.step != nm.step:
-                continue
-            if foundNM.resource != nm.resource:
-                continue
+    @staticmethod
+    def getVersionFilePathsBatch( filePaths ):
+        """Gets the version files of several files at once.
+        The versions folders are scanned in parallel, which is faster on network drives.
 
-            versionFiles.append( foundFilePath )
+        Returns a list containing the list of version file paths of each file, in the same order"""
 
-        versionFiles.sort( key = RamFileManager._versionFilesSorter )
-        return versionFiles
+        return RamFileManager._mapInThreads( RamFileManager.getVersionFilePaths, filePaths, 8, 32 )
+
+    @staticmethod
+    def _mapInThreads( function, items, minItems=4, maxWorkers=8 ):
+        """Low-level, undocumented. Calls the function for each item, in parallel threads when there are at least minItems items:
+        with fewer items, it's not worth starting the threads.
+
+        The functions only get data from the file system, and the caches they share are safe to use from several threads:
+        the lru_cache are thread-safe, and the dict caches are only read and set as whole entries, which is atomic in CPython.
+        At worst, two threads compute the same entry at the same time and one of the results is kept.
+
+        Returns: list, the results in the same order as the items
+        """
+        if len( items ) < minItems:
+            return [ function( item ) for item in items ]
+
+        with ThreadPoolExecutor( max_workers=min( maxWorkers, len( items ) ) ) as executor:
+            return list( executor.map( function, items ) )
 
     @staticmethod
     def getVersionFolder( filePath ):
         """Gets the versions folder for this file"""
 
+        # Split only once, instead of checking each reserved folder with the in*Folder() methods
         fileFolder = os.path.dirname( filePath )
-        versionsFolderName = settings.folderNames.versions
+        wipFolder, parentName = os.path.split( fileFolder )
+        versionsFolderName = VERSIONS_FOLDER
 
-        if RamFileManager.inVersionsFolder( filePath ):
+        if parentName == VERSIONS_FOLDER:
             versionsFolder = fileFolder
 
-        elif RamFileManager.inPublishFolder( filePath ) or RamFileManager.inPreviewFolder( filePath ):
-            wipFolder = os.path.dirname( fileFolder )
+        elif parentName in ( PUBLISH_FOLDER, PREVIEW_FOLDER ) or os.path.basename( wipFolder ) == PUBLISH_FOLDER:
             versionsFolder = wipFolder + '/' + versionsFolderName
-        
+
         else:
             versionsFolder = fileFolder + '/' + versionsFolderName
 
+        # A single stat when it exists, which is most of the time;
+        # and safe if another thread creates it at the same time
         if not os.path.isdir( versionsFolder ):
-            os.makedirs( versionsFolder )
+            os.makedirs( versionsFolder, exist_ok=True )
 
         return versionsFolder
 
@@ -473,56 +630,43 @@ class RamFileManager():
         """Gets the published folder for this file"""
 
         fileFolder = os.path.dirname( filePath )
-        publishFolderName = settings.folderNames.publish
+        wipFolder, parentName = os.path.split( fileFolder )
+        publishFolderName = PUBLISH_FOLDER
 
-        if RamFileManager.inPublishFolder( filePath ):
+        if parentName == PUBLISH_FOLDER or os.path.basename( wipFolder ) == PUBLISH_FOLDER:
             publishFolder = fileFolder
 
-        elif RamFileManager.inVersionsFolder( filePath ) or RamFileManager.inPreviewFolder( filePath ):
-            wipFolder = os.path.dirname( fileFolder )
+        elif parentName in ( VERSIONS_FOLDER, PREVIEW_FOLDER ):
             publishFolder = wipFolder + '/' + publishFolderName
 
         else:
             publishFolder = fileFolder + '/' + publishFolderName
 
         if not os.path.isdir( publishFolder ):
-            os.makedirs( publishFolder )
+            os.makedirs( publishFolder, exist_ok=True )
 
         return publishFolder
 
     @staticmethod
     def inPreviewFolder( path ):
         """Checks if the given path is inside a "preview" folder"""
-        currentFolder = os.path.dirname(path)
-        currentFolderName = os.path.basename( currentFolder )
-        return currentFolderName == settings.folderNames.preview
+        return RamFileManager._parentFolderName( path ) == PREVIEW_FOLDER
 
     @staticmethod
     def inPublishFolder( path ):
         """Checks if the given path is inside a "published" folder"""
-        currentFolder = os.path.dirname(path)
-        currentFolderName = os.path.basename( currentFolder )
-        if currentFolderName == settings.folderNames.publish: return True
-        currentFolder = os.path.dirname(currentFolder)
-        currentFolderName = os.path.basename( currentFolder )
-        return currentFolderName == settings.folderNames.publish
+        if RamFileManager._parentFolderName( path ) == PUBLISH_FOLDER: return True
+        return RamFileManager._parentFolderName( os.path.dirname(path) ) == PUBLISH_FOLDER
 
     @staticmethod
     def inVersionsFolder( path ):
         """Checks if the given path is inside a "versions" folder"""
-        currentFolder = os.path.dirname(path)
-        currentFolderName = os.path.basename( currentFolder )
-        return currentFolderName == settings.folderNames.versions
+        return RamFileManager._parentFolderName( path ) == VERSIONS_FOLDER
 
     @staticmethod
     def isReservedFolder( path ):
         """Checks if this is a reserved folder"""
-        name = os.path.basename( path )
-        return name in [
-            FolderNames.versions,
-            FolderNames.publish,
-            FolderNames.preview
-        ]
+        return os.path.basename( path ) in RESERVED_FOLDERS
 
     @staticmethod
     def inReservedFolder( path ):
@@ -541,35 +685,24 @@ class RamFileManager():
         if name == "":
             return True
 
-        regex = re.compile('^[ a-zA-Z0-9+-]{1,256}$', re.IGNORECASE)
-        if re.match(regex, name):
-            return True
-        return False
+        return RE_NAME.match( name ) is not None
 
     @staticmethod
     def validateShortName( name ):
         """Checks if the name is valid, respects the Ramses naming scheme"""
-        regex = re.compile('^[a-z0-9+-]{1,10}$', re.IGNORECASE)
-        if re.match(regex, name):
-            return True
-        return False
+        return RE_SHORTNAME.match( name ) is not None
 
     @staticmethod
     def buildPath( folders ):
         """Builds a path with a list of folder names or subpaths,
         adding the '/' only if needed, and ignoring empty blocks"""
 
-        fullPath = ''
-
-        for folder in folders:
-            if folder == '':
-                continue
-            if not fullPath.endswith('/') and not fullPath == '':
-                fullPath = fullPath + '/'
-                
-            fullPath = fullPath + folder
+        folders = [ folder for folder in folders if folder != '' ]
+        if len( folders ) == 0:
+            return ''
 
-        return fullPath
+        # Join everything at once instead of concatenating block by block
+        return ''.join( [ folder if folder.endswith('/') else folder + '/' for folder in folders[:-1] ] ) + folders[-1]
 
     @staticmethod
     def _isRamsesItemFoldername( n ):
@@ -580,8 +713,110 @@ class RamFileManager():
 
         Returns: bool
         """
-        if re.match( '^([a-z0-9+-]{1,10})_([ASG])_([a-z0-9+-]{1,10})$', n , re.IGNORECASE): return True
-        return False
+        # Most folders are rejected by their number of blocks or their type, without running the regex
+        blocks = n.split( '_' )
+        if len( blocks ) != 3 or blocks[1].upper() not in ( 'A', 'S', 'G' ):
+            return False
+        return RE_ITEM_FOLDER.match( n ) is not None
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parentFolderName( path ):
+        """Low-level, undocumented. Gets the name of the folder containing the path.
+        Cached, as the same paths are checked several times when saving, versioning and publishing a file.
+
+        Returns: str
+        """
+        return os.path.basename( os.path.dirname( path ) )
+
+    @staticmethod
+    def _iterVersionFiles( versionsFolder, fileInfo ):
+        """Low-level, undocumented. Iterates over the files in the versions folder
+        which are versions of the file described by the RamFileInfo.
+
+        Yields: tuple (version, os.DirEntry, RamFileInfo)
+        """
+        # All the versions start the same way, no need to parse the other files
+        fileNamePrefix = RamFileManager._getFileNamePrefix( fileInfo, True )
+        # What must be the same in the versions
+        fileIdentity = ( fileInfo.project, fileInfo.ramType, fileInfo.shortName, fileInfo.step, fileInfo.resource )
+
+        # scandir gets the file type along with the name, no need to stat each file
+        with os.scandir( versionsFolder ) as foundFiles:
+            for foundFile in foundFiles:
+                if not foundFile.name.startswith( fileNamePrefix ):
+                    continue
+                if not foundFile.is_file(): # This is in case the user has created folders in _versions
+                    continue
+
+                foundNM = RamFileInfo()
+                if not foundNM.setFileName( foundFile.name ):
+                    continue
+                if ( foundNM.project, foundNM.ramType, foundNM.shortName, foundNM.step, foundNM.resource ) != fileIdentity:
+                    continue
+
+                yield ( foundNM.version, foundFile, foundNM )
+
+    @staticmethod
+    def _listRamsesFiles( folderPath ):
+        """Low-level, undocumented. Lists the files respecting the Ramses naming scheme in the folder, and parses their names.
+        The result is kept for a short time, as the same folders are listed several times in a row
+        (to get the latest version, the version files, etc.). Don't modify the returned RamFileInfo.
+        A file written with copy() drops the listing of its folder; the files saved by the applications show up when it expires.
+
+        Returns: list of tuple (fileName, RamFileInfo)
+        """
+        # The same folder may be given with other separators or a trailing slash
+        folderKey = os.path.normpath( folderPath )
+        cachedListing = RamFileManager.__folderListings.get( folderKey )
+        if cachedListing is not None and time.time() - cachedListing[1] < FOLDER_LISTINGS_TIMEOUT:
+            return cachedListing[0]
+
+        listing = []
+        # Don't check the folder first, it's there most of the time
+        try:
+            with os.scandir( folderPath ) as entries:
+                for entry in entries:
+                    nm = RamFileInfo()
+                    if nm.setFileName( entry.name ):
+                        listing.append( ( entry.name, nm ) )
+        except ( FileNotFoundError, NotADirectoryError ):
+            log( "This folder doesn't exist: " + folderPath, LogLevel.Debug )
+            return listing
+
+        if len( RamFileManager.__folderListings ) > 256:
+            RamFileManager.__folderListings.clear()
+        RamFileManager.__folderListings[folderKey] = ( listing, time.time() )
+
+        return listing
+
+    @staticmethod
+    def _forgetListing( folderPath ):
+        """Low-level, undocumented. Removes the folder from the listings cache, must be called when a file is written in the folder.
+
+        Returns: None
+        """
+        RamFileManager.__folderListings.pop( os.path.normpath( folderPath ), None )
+
+    @staticmethod
+    def _versionFileKey( versionFile ):
+        """Low-level, undocumented. Sort key for the tuples yielded by _iterVersionFiles"""
+        return versionFile[0]
+
+    @staticmethod
+    def _getFileNamePrefix( fileInfo, withResource=False ):
+        """Low-level, undocumented. Gets the beginning of the name shared by all the files of the same item and step
+        (everything before the resource and the version, or before the version if withResource is True),
+        to quickly filter out files without parsing their names.
+
+        Returns: str
+        """
+        prefixInfo = fileInfo.copy()
+        if not withResource:
+            prefixInfo.resource = ''
+        prefixInfo.version = -1
+        prefixInfo.extension = ''
+        return prefixInfo.fileName()
 
     @staticmethod
     def _fixResourceStr( resourceStr ):
@@ -589,30 +824,7 @@ class RamFileManager():
 
         Returns: str
         """
-        forbiddenCharacters = {
-            '"' : ' ',
-            '_' : '-',
-            '[' : '-',
-            ']' : '-',
-            '{' : '-',
-            '}' : '-',
-            '(' : '-',
-            ')' : '-',
-            '\'': ' ',
-            '`' : ' ',
-            '.' : '-',
-            '/' : '-',
-            '\\' : '-',
-            ',' : ' ' 
-            }
-
-        fixedResourceStr = ''
-        for char in resourceStr:
-            if char in forbiddenCharacters:
-                fixedResourceStr = fixedResourceStr + forbiddenCharacters[char]
-            else:
-                fixedResourceStr = fixedResourceStr + char
-        return fixedResourceStr
+        return resourceStr.translate( RamFileManager.__resourceTranslation )
 
     @staticmethod
     def _versionFilesSorter( f ):
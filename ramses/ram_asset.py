@@ -29,6 +29,8 @@ DAEMON = RamDaemonInterface.instance()
 class RamAsset( RamItem ):
     """A class representing an asset."""
 
+    __slots__ = ()
+
     @staticmethod
     def fromPath( fileOrFolderPath, virtualIfNotFound = False ):
         """Returns a RamAsset instance built using the given path.
@@ -53,13 +53,20 @@ class RamAssetGroup( RamObject ):
             uuid (str)
         """
         super(RamAssetGroup, self).__init__( uuid, data, create, "RamAssetGroup" )
+        self.__project = None
 
     def project(self):
         """The project containing this group"""
+        # The project can't change, keep the same instance (and its cached data)
+        if self.__project is not None:
+            return self.__project
+
         from .ram_project import RamProject
+
         uuid = self.get("project", "")
         if uuid != "":
-            return RamProject(uuid)
+            self.__project = RamProject(uuid)
+            return self.__project
         return None
     
     def assets(self):
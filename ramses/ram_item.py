@@ -18,24 +18,52 @@
 #======================= END GPL LICENSE BLOCK ========================
 
 import os
-from platform import version
 from .file_info import RamFileInfo
 from .ram_object import RamObject
-from .file_manager import RamFileManager
-from .file_info import RamFileInfo
+from .file_manager import RamFileManager, VERSIONS_FOLDER, PUBLISH_FOLDER, PREVIEW_FOLDER
 from .daemon_interface import RamDaemonInterface
 from .logger import log
-from .constants import Log, LogLevel, ItemType, FolderNames
+from .constants import LogLevel, ItemType
 
 # Keep the daemon at hand
 DAEMON = RamDaemonInterface.instance()
 
+# The item types and the corresponding daemon object types
+ITEM_TYPES = {
+    "RamShot": ItemType.SHOT,
+    "RamAsset": ItemType.ASSET
+}
+OBJECT_TYPES = {
+    ItemType.SHOT: "RamShot",
+    ItemType.ASSET: "RamAsset"
+}
+
 class RamItem( RamObject ):
     """
     Base class for RamAsset and RamShot.
     An item of the project, either an asset or a shot.
     """
 
+    __slots__ = ( '__itemType', )
+
+    # The classes of the items, resolved the first time they're needed as their modules import this one
+    __itemClasses = None
+
+    @staticmethod
+    def _itemClass( ramType ):
+        """Low-level, undocumented. Gets the class to instantiate for the given item type.
+
+        Returns: type
+        """
+        if RamItem.__itemClasses is None:
+            from .ram_asset import RamAsset
+            from .ram_shot import RamShot
+            RamItem.__itemClasses = {
+                ItemType.ASSET: RamAsset,
+                ItemType.SHOT: RamShot
+            }
+        return RamItem.__itemClasses.get( ramType, RamItem )
+
     @staticmethod
     def fromPath( fileOrFolderPath, virtualIfNotFound = False ):
         """Returns a RamAsset or RamShot instance built using the given path.
@@ -49,36 +77,25 @@ class RamItem( RamObject ):
             RamAsset or RamShot
         """
 
-        from .ram_asset import RamAsset
-        from .ram_shot import RamShot
-        from .ramses import Ramses
-
-        RAMSES = Ramses.instance()
-
         nm = RamFileInfo()
         nm.setFilePath( fileOrFolderPath )
 
-        if nm.ramType == ItemType.ASSET:
-            uuid = DAEMON.uuidFromPath( fileOrFolderPath, "RamAsset" )
-        elif nm.ramType == ItemType.SHOT:
-            uuid = DAEMON.uuidFromPath( fileOrFolderPath, "RamShot" )
-        else:
-            uuid = DAEMON.uuidFromPath( fileOrFolderPath, "RamItem" )
+        uuid = DAEMON.uuidFromPath( fileOrFolderPath, OBJECT_TYPES.get( nm.ramType, "RamItem" ) )
+
+        itemClass = RamItem._itemClass( nm.ramType )
 
         if uuid != "":
-            if nm.ramType == ItemType.ASSET:
-                return RamAsset(uuid)
-            elif nm.ramType == ItemType.SHOT:
-                return RamShot(uuid)
-            else:
-                return RamItem(uuid)
+            return itemClass(uuid)
 
         if virtualIfNotFound:
+            from .ramses import Ramses
+
             # Get some info from the file name
-            project = RAMSES.project( nm.project )
+            project = Ramses.instance().project( nm.project )
             projectUuid = ""
             # Get the right folder
-            folderPath = RamFileManager.getSaveFilePath( fileOrFolderPath )
+            # The path has already been parsed, don't walk up the tree again
+            folderPath = RamFileManager._getSaveFilePath( fileOrFolderPath, nm )
             folderPath = os.path.dirname(folderPath)
             if project:
                 projectUuid = project.uuid()
@@ -90,12 +107,7 @@ class RamItem( RamObject ):
                 "folderPath": folderPath
             }
 
-            if nm.ramType == ItemType.ASSET:
-                return RamAsset(data=data, create=False)
-            elif nm.ramType == ItemType.SHOT:
-                return RamShot(data=data, create=False)
-            else:
-                return RamItem(data=data, create=False)
+            return itemClass(data=data, create=False)
 
         log( "The given path does not belong to an item", LogLevel.Debug )
         return None
@@ -107,12 +119,7 @@ class RamItem( RamObject ):
             uuid (str)
         """
         super(RamItem, self).__init__( uuid, data, create, objectType )
-        if objectType == "RamShot":
-            self.__itemType = ItemType.SHOT
-        elif objectType == "RamAsset":
-            self.__itemType = ItemType.ASSET
-        else:
-            self.__itemType = ItemType.GENERAL
+        self.__itemType = ITEM_TYPES.get( objectType, ItemType.GENERAL )
 
     def currentStatus( self, step ):
         """The current status for the given step
@@ -135,19 +142,26 @@ class RamItem( RamObject ):
         # Ask Daemon
         return DAEMON.getStatus( self.uuid(), stepUuid )
 
-    def isPublished( self, step="" ):
+    def isPublished( self, step="", resource=None ):
         """Convenience function to check if there are published files in the publish folder.
-            Equivalent to len(self.publishedVersionFolderPaths(step, resource)) > 0
+            Equivalent to len(self.publishedVersionFolderPaths(step, resource=resource)) > 0
 
         Args:
             step (RamStep)
-            resource (str, optional): Defaults to "".
+            resource (str, optional): Defaults to None (checks all resources).
 
         Returns:
             bool
         """
-        result = self.publishedVersionFolderPaths( step )
-        return len( result ) > 0
+        # Stop at the first version folder found, no need to list and sort them all
+        for folder in self._iterPublishedVersionFolders( step ):
+            if resource is None:
+                return True
+            # Same check as publishedVersionFolderPaths
+            folderName = os.path.basename( folder ).split('_')
+            if len(folderName) != 3 and resource == '': return True
+            if len(folderName) == 3 and resource == folderName[0]: return True
+        return False
 
     def itemType( self ):
         """Returns the type of the item"""
@@ -173,27 +187,29 @@ class RamItem( RamObject ):
             int
         """
 
-        state = RamObject.getShortName(state)
-        step = RamObject.getShortName(step)
+        return self._latestVersionFile( resource, state, step )[0]
 
-        highestVersion = -1
-       
-        versionFolder = self.versionFolderPath( step )
-        if versionFolder == '':
-            return highestVersion
+    def latestVersions( self, steps, resource="", state="" ):
+        """Returns the highest version number of each step, for the given resource and state (or all states if empty string).
+        The steps are checked in parallel, which is faster than calling latestVersion() for each step, especially on network drives.
 
-        for file in os.listdir( versionFolder ):
-            nm = RamFileInfo()
-            if not nm.setFileName( file ):
-                continue
-            if nm.step != step and step != '':
-                continue
-            if nm.resource == resource:
-                if nm.state == state or state == "":
-                    if nm.version > highestVersion:
-                        highestVersion = nm.version
+        Args:
+            steps (list of RamStep or str)
+            resource (str, optional): Defaults to "".
+            state (str, optional): Defaults to "".
+
+        Returns:
+            dict of int, the keys are the step short names
+        """
+
+        stepShortNames = [ RamObject.getShortName( step ) for step in steps ]
 
-        return highestVersion
+        def latestVersion( step ):
+            return self.latestVersion( resource, state, step )
+
+        versions = RamFileManager._mapInThreads( latestVersion, stepShortNames, 4, 8 )
+
+        return dict( zip( stepShortNames, versions ) )
 
     def latestVersionFilePath( self, resource="", state="", step="" ):
         """Latest version file path
@@ -206,32 +222,34 @@ class RamItem( RamObject ):
             str
         """
 
-        step = RamObject.getShortName(step)
+        return self._latestVersionFile( resource, state, step )[1]
+
+    def _latestVersionFile( self, resource, state, step ):
+        """Low-level, undocumented. Finds the file with the highest version in a single pass over the version folder.
+        The first file found wins if there are several files with the same version.
+
+        Returns: tuple (version, filePath), (-1, '') if there's no version file
+        """
 
-        versionFolderPath = self.versionFolderPath(step )
+        state = RamObject.getShortName(state)
+        step = RamObject.getShortName(step)
 
+        versionFolderPath = self._versionFolderPath( step, create=False )
         if versionFolderPath == '':
-            return ''
+            return ( -1, '' )
 
-        versionFile = ''
-        highestVersion = -1
+        versionFile = max( (
+            f for f in RamFileManager._listRamsesFiles( versionFolderPath )
+            if ( f[1].step == step or step == '' ) and f[1].resource == resource and ( f[1].state == state or state == '' ) and f[1].version > -1
+            ), key=lambda f: f[1].version, default=None )
 
-        for file in os.listdir( versionFolderPath ):
-            nm = RamFileInfo()
-            if not nm.setFileName( file ):
-                continue
-            if nm.step != step and step != '':
-                continue
-            if nm.resource == resource:
-                if nm.state == state or state == '':
-                    if nm.version > highestVersion:
-                        highestVersion = nm.version
-                        versionFile = RamFileManager.buildPath((
-                            versionFolderPath,
-                            file
-                        ))
+        if versionFile is None:
+            return ( -1, '' )
 
-        return versionFile
+        return ( versionFile[1].version, RamFileManager.buildPath((
+            versionFolderPath,
+            versionFile[0]
+        )) )
 
     def previewFolderPath( self, step="" ):
         """Gets the path to the preview folder.
@@ -249,10 +267,9 @@ class RamItem( RamObject ):
         if stepFolder == '':
             return ''
 
-        previewFolder = RamFileManager.buildPath(( 
-            stepFolder,
-            FolderNames.preview
-            ))
+        if not stepFolder.endswith('/'):
+            stepFolder = stepFolder + '/'
+        previewFolder = stepFolder + PREVIEW_FOLDER
 
         if not os.path.isdir(previewFolder):
             os.makedirs(previewFolder)
@@ -295,12 +312,14 @@ class RamItem( RamObject ):
 
     def projectShortName(self):
         """Returns the short name of the project this item belongs to"""
+        return self._cached( 'projectShortName', self.__getProjectShortName )
 
+    def __getProjectShortName(self):
+        """Private method to get the project short name from the daemon"""
         proj = self.project()
         if proj:
             return proj.shortName()
-        else:
-            return ""
+        return ""
 
     def publishFolderPath( self, step=""):
         """Gets the path to the publish folder.
@@ -312,18 +331,25 @@ class RamItem( RamObject ):
         Returns:
             str
         """
+        return self._publishFolderPath( step )
+
+    def _publishFolderPath( self, step, create=True ):
+        """Low-level, undocumented. Path to the publish folder.
+        The methods which only read the folder don't need to create it.
+
+        Returns: str
+        """
         # Check step, return shortName (str) or "" or raise TypeError:
-        stepFolder = self.stepFolderPath(step )
+        stepFolder = self._stepFolderPath( step, create=create )
 
         if stepFolder == '':
             return ''
 
-        publishFolder = RamFileManager.buildPath(( 
-            stepFolder,
-            FolderNames.publish
-            ))
+        if not stepFolder.endswith('/'):
+            stepFolder = stepFolder + '/'
+        publishFolder = stepFolder + PUBLISH_FOLDER
 
-        if not os.path.isdir(publishFolder):
+        if create and not os.path.isdir(publishFolder):
             os.makedirs(publishFolder)
 
         return publishFolder
@@ -340,14 +366,7 @@ class RamItem( RamObject ):
             list of str
         """
 
-        publishFolderPath = self.publishFolderPath(step)
-
-        versionFolders = []
-        for f in os.listdir(publishFolderPath):
-            folderPath = RamFileManager.buildPath(( publishFolderPath, f ))
-            if not os.path.isdir(folderPath): continue
-            versionFolders.append( folderPath )
-
+        versionFolders = list( self._iterPublishedVersionFolders( step ) )
         versionFolders.sort(key=RamFileManager._publishVersionFoldersSorter)
 
         if len(versionFolders) == 0: return versionFolders
@@ -367,23 +386,47 @@ class RamItem( RamObject ):
                 publishedFolders.append(folder)
                 continue
 
-            for f in os.listdir(folder):
-                if f == fileName: publishedFolders.append(folder)
+            # Stop reading the folder as soon as the file is found
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name == fileName:
+                        publishedFolders.append(folder)
+                        break
 
         return publishedFolders
 
+    def _iterPublishedVersionFolders( self, step="" ):
+        """Low-level, undocumented. Iterates over the version folders in the publish folder, in no particular order.
+
+        Yields: str
+        """
+        publishFolderPath = self._publishFolderPath( step, False )
+        if publishFolderPath == '':
+            return
+
+        folderPrefix = publishFolderPath if publishFolderPath.endswith('/') else publishFolderPath + '/'
+        # The entries know their type, no need to stat each of them
+        try:
+            with os.scandir(publishFolderPath) as entries:
+                for entry in entries:
+                    if not entry.is_dir(): continue
+                    yield folderPrefix + entry.name
+        except ( FileNotFoundError, NotADirectoryError ):
+            return
+
     def stepFilePath(self, resource="", extension="", step="", ):
         """Returns a specific step file"""
         step = RamObject.getShortName( step )
 
-        stepFolder = self.stepFolderPath(step)
-        if stepFolder == '':
-            return ''
-
+        # Get the project once, it's needed for the folder too
         pShortName = self.projectShortName()
         if pShortName == '':
             return ''
 
+        stepFolder = self._stepFolderPath(step, pShortName, False)
+        if stepFolder == '':
+            return ''
+
         nm = RamFileInfo()
         nm.project = pShortName
         nm.step = step
@@ -406,35 +449,49 @@ class RamItem( RamObject ):
         """Returns the step files"""
         step = RamObject.getShortName( step )
 
-        stepFolder = self.stepFolderPath(step)
-        if stepFolder == '':
-            return []
-
+        # Get the project once, it's needed for the folder too
         pShortName = self.projectShortName()
         if pShortName == '':
             return []
 
+        stepFolder = self._stepFolderPath(step, pShortName, False)
+        if stepFolder == '':
+            return []
+
         files = []
+        folderPrefix = stepFolder if stepFolder.endswith('/') else stepFolder + '/'
+        # Get these once, not for each file
+        shortName = self.shortName()
+        itemType = self.itemType()
 
-        for file in os.listdir(stepFolder):
+        for fileName, nm in RamFileManager._listRamsesFiles( stepFolder ):
             # check file
-            nm = RamFileInfo()
-            if not nm.setFileName( file ):
-                continue
-            if nm.project != pShortName or nm.step != step or nm.shortName != self.shortName() or nm.ramType != self.itemType():
+            if nm.project != pShortName or nm.step != step or nm.shortName != shortName or nm.ramType != itemType:
                 continue
-            files.append(RamFileManager.buildPath((
-                stepFolder,
-                file
-            )))
+            files.append( folderPrefix + fileName )
         return files
 
     def stepFolderPath(self, step=""):
         """Returns the working folder for the given step"""
+        return self._stepFolderPath( step )
+
+    def _stepFolderPath(self, step, projectShortName=None, create=True):
+        """Low-level, undocumented. Returns the working folder for the given step.
+        The project short name can be given if the caller already has it, to not get it again.
+        The methods which only read the folder don't need to create it.
+
+        Returns: str
+        """
         # General items don't have subfolders for steps
         # Return the step path
         if self.itemType() == ItemType.GENERAL:
-            return step.folderPath()
+            if RamObject.isUuid( step ):
+                step = RamObject( step )
+            if isinstance( step, RamObject ):
+                return step.folderPath()
+            # Just a short name, we can't get the step folder
+            log( "Can't get the folder of the step " + str(step) + " from its short name only.", LogLevel.Debug )
+            return ""
 
         # We need a short name
         step = RamObject.getShortName( step )
@@ -443,21 +500,22 @@ class RamItem( RamObject ):
         if folderPath == "" or step == "":
             return folderPath
 
-        project = self.projectShortName()
+        if projectShortName is None:
+            projectShortName = self.projectShortName()
 
         nm = RamFileInfo()
-        nm.project = project
+        nm.project = projectShortName
         nm.step = step
         nm.ramType = self.itemType()
         nm.shortName = self.shortName()
         stepFolderName = nm.fileName()
 
-        stepFolderPath = RamFileManager.buildPath((
-            folderPath,
-            stepFolderName
-        ))
+        # Both parts are known not to be empty, no need for the generic buildPath
+        if not folderPath.endswith('/'):
+            folderPath = folderPath + '/'
+        stepFolderPath = folderPath + stepFolderName
 
-        if not os.path.isdir(stepFolderPath):
+        if create and not os.path.isdir(stepFolderPath):
             os.makedirs( stepFolderPath )
 
         return stepFolderPath
@@ -467,40 +525,39 @@ class RamItem( RamObject ):
 
         step = RamObject.getShortName( step )
 
-        versionFolderPath = self.versionFolderPath(step )
-
-        if versionFolderPath == '':
-            return ''
-
+        # Get the project once, it's needed for the folder too
         pShortName = self.projectShortName()
         if pShortName == '':
             return []
 
+        versionFolderPath = self._versionFolderPath(step, pShortName, False)
+
+        if versionFolderPath == '':
+            return []
+
         files = []
+        folderPrefix = versionFolderPath if versionFolderPath.endswith('/') else versionFolderPath + '/'
+        # Get these once, not for each file
+        shortName = self.shortName()
+        itemType = self.itemType()
 
-        for file in os.listdir( versionFolderPath ):
-            nm = RamFileInfo()
-            if not nm.setFileName( file ):
-                continue
+        for fileName, nm in RamFileManager._listRamsesFiles( versionFolderPath ):
             if nm.project != pShortName:
                 continue
-            itemType = self.itemType()
             if nm.ramType != itemType:
                 continue
             if itemType == ItemType.GENERAL:
-                if self.shortName() != nm.shortName:
+                if shortName != nm.shortName:
                     continue
             else:
-                if nm.step != step or nm.shortName != self.shortName():
+                if nm.step != step or nm.shortName != shortName:
                     continue
             if nm.resource == resource:
-                files.append(RamFileManager.buildPath((
-                    versionFolderPath,
-                    file
-                )))
+                # Keep the version for sorting, the name has already been parsed
+                files.append( ( nm.version, folderPrefix + fileName ) )
 
-        files.sort( key = RamFileManager._versionFilesSorter )
-        return files
+        files.sort( key=lambda f: f[0] )
+        return [ f[1] for f in files ]
 
     def versionFolderPath( self, step="" ): 
         """Path to the version folder relative to the item root folder
@@ -511,18 +568,26 @@ class RamItem( RamObject ):
         Returns:
             str
         """
+        return self._versionFolderPath( step )
+
+    def _versionFolderPath( self, step, projectShortName=None, create=True ):
+        """Low-level, undocumented. Path to the version folder.
+        The project short name can be given if the caller already has it, to not get it again.
+        The methods which only read the folder don't need to create it.
+
+        Returns: str
+        """
         # Check step, return shortName (str) or "" or raise TypeError:
-        stepFolder = self.stepFolderPath( step )
+        stepFolder = self._stepFolderPath( step, projectShortName, create )
 
         if stepFolder == '':
             return ''
 
-        versionFolder = RamFileManager.buildPath(( 
-            stepFolder,
-            FolderNames.versions
-            ))
+        if not stepFolder.endswith('/'):
+            stepFolder = stepFolder + '/'
+        versionFolder = stepFolder + VERSIONS_FOLDER
 
-        if not os.path.isdir(versionFolder):
+        if create and not os.path.isdir(versionFolder):
             os.makedirs( versionFolder )
         
         return versionFolder
@@ -535,6 +600,11 @@ class RamItem( RamObject ):
             str
         """
 
+        # The group is another object, don't build its query when offline
+        from .ramses import Ramses
+        if not Ramses.instance().online():
+            return ""
+
         groupData = {}
 
         if self.__itemType == ItemType.SHOT:
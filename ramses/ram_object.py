@@ -31,10 +31,22 @@ RE_UUID = re.compile("^[a-zA-Z0-9]+-[a-zA-Z0-9]+-[a-zA-Z0-9]+-[a-zA-Z0-9]+-[a-zA
 class RamObject(object):
     """The base class for most of Ramses objects."""
 
+    # Lots of objects are created when listing the project contents; slots make them lighter
+    __slots__ = (
+        '__virtual',
+        '__uuid',
+        '__data',
+        '__cacheTime',
+        '__cache'
+        )
+
     @staticmethod
     def isUuid( string ):
         if not isinstance(string, str):
             return False
+        # Short names are checked all the time, most of them can't be uuids
+        if string.count('-') != 4:
+            return False
         if RE_UUID.match(string):
             return True
         return False
@@ -54,10 +66,11 @@ class RamObject(object):
 
     @staticmethod
     def getShortName( obj ):
-        if RamObject.isUuid( obj ):
-            obj = RamObject(obj)
+        # Check the objects first, it's cheaper than the uuid regex
         if isinstance(obj, RamObject):
             return obj.shortName()
+        if RamObject.isUuid( obj ):
+            return RamObject(obj).shortName()
         # Must already be a short name
         return obj
 
@@ -85,6 +98,8 @@ class RamObject(object):
             self.__data = {}
             self.__cacheTime = 0
 
+        self.__cache = {}
+
         if create:
             reply = DAEMON.create( self.__uuid, self.__data, objectType )
             if not DAEMON.checkReply(reply):
@@ -122,10 +137,38 @@ class RamObject(object):
 
         self.__data = data
         self.__cacheTime = time.time()
+        # The values computed from the previous data are now wrong
+        self._invalidateCache()
 
         if not self.__virtual:
             DAEMON.setData( self.__uuid, data )
 
+    def _cached( self, key, compute ):
+        """Low-level, undocumented. Gets a value computed from the data, calling compute() if it's not known yet.
+        The values (like the folder or the project of the objects) take a few queries to the daemon
+        and they're needed again and again to build the paths and file names;
+        they're kept with the same 2-second timeout as the data.
+        None and empty strings are not kept, they usually mean a query failed.
+
+        Returns: the value returned by compute()
+        """
+        # The entry is set at once, the threads scanning the folders may read it at the same time
+        cached = self.__cache.get( key )
+        if cached is not None and time.time() - cached[1] < 2:
+            return cached[0]
+
+        value = compute()
+        if value is not None and value != "":
+            self.__cache[key] = ( value, time.time() )
+        return value
+
+    def _invalidateCache( self ):
+        """Low-level, undocumented. Forgets the values kept by _cached(), they'll be computed again when they're needed.
+
+        Returns: None
+        """
+        self.__cache = {}
+
     def get(self, key, default = None):
         """Get a specific value in the data"""
         data = self.data()
@@ -142,6 +185,11 @@ class RamObject(object):
         Returns:
             str
         """
+        # Don't build a daemon query when offline, the data may already be there
+        if not self.__virtual:
+            from .ramses import Ramses
+            if not Ramses.instance().online():
+                return self.__data.get('name', 'Unknown Object')
         return self.get('name', 'Unknown Object')
 
     def shortName( self ):
@@ -179,6 +227,11 @@ class RamObject(object):
         """Returns the folder corresponding to this object"""
         if self.__virtual:
             return self.get("folderPath", "")
+
+        return self._cached( 'folderPath', self.__getFolderPath )
+
+    def __getFolderPath( self ):
+        """Private method to get the folder from the daemon, and create it if it doesn't exist"""
         p = DAEMON.getPath( self.__uuid )
         if p != "" and not os.path.isdir( p ):
             try:
@@ -37,11 +37,27 @@ class RamPipe( RamObject ):
 
     def inputStep(self):
         from .ram_step import RamStep
-        return RamStep( self.get("inputStep", ""))
+        return RamStep( self.inputStepUuid() )
 
     def outputStep(self):
         from .ram_step import RamStep
-        return RamStep( self.get("outputStep", ""))
+        return RamStep( self.outputStepUuid() )
+
+    def inputStepUuid( self ):
+        """The uuid of the input step, without building the step
+
+        Returns:
+            str
+        """
+        return self.get("inputStep", "")
+
+    def outputStepUuid( self ):
+        """The uuid of the output step, without building the step
+
+        Returns:
+            str
+        """
+        return self.get("outputStep", "")
 
     def inputStepShortName( self ):
         """The short name of the input step
@@ -30,15 +30,22 @@ class RamSequence( RamObject ):
             uuid (str)
         """
         super(RamSequence, self).__init__( uuid, data, create, "RamSequence" )
+        self.__project = None
 
     def project(self):
         """Returns the project this sequence belongs to
         Returns:
             RamProject"""
+        # The project can't change, keep the same instance (and its cached data)
+        if self.__project is not None:
+            return self.__project
+
         from .ram_project import RamProject
+
         uuid = self.get("project", "")
         if uuid != "":
-            return RamProject(uuid)
+            self.__project = RamProject(uuid)
+            return self.__project
         return None
 
     def shots(self):
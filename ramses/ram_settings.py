@@ -18,7 +18,7 @@
 #======================= END GPL LICENSE BLOCK ========================
 
 import os
-import platform
+import sys
 import json
 from .constants import FolderNames, LogLevel
 from .logger import log
@@ -83,8 +83,8 @@ class RamSettings( object ):
             cls.generalHelpUrl = "https://ramses.rxlab.guide"
 
             # Set the path to the settings file and temporary folder (os-specific)
-            system = platform.system()
-            if system == 'Windows':
+            # sys.platform is a constant, platform.system() may have to query the OS
+            if sys.platform.startswith('win'):
                 cls._folderPath = os.path.expandvars('${APPDATA}/RxLaboratory/Ramses/Config')
                 if not os.path.isdir( cls._folderPath ): 
                     os.makedirs( cls._folderPath )
@@ -96,24 +96,15 @@ class RamSettings( object ):
             # Get settings from file
             if os.path.isfile( cls._filePath ):
                 with open(cls._filePath, 'r', encoding="utf8") as settingsFile:
-                    settingsStr = settingsFile.read()
-                    settingsDict = json.loads( settingsStr )
-                    if 'clientPath' in settingsDict:
-                        cls.ramsesClientPath = settingsDict['clientPath']
-                    if 'clientPort' in settingsDict:
-                        cls.ramsesClientPort = settingsDict['clientPort']
-                    if 'logLevel' in settingsDict:
-                        cls.logLevel = settingsDict['logLevel']
-                    if 'autoIncrementTimeout' in settingsDict:
-                        cls.autoIncrementTimeout = settingsDict['autoIncrementTimeout']
-                    if 'debugMode' in settingsDict:
-                        cls.debugMode = settingsDict['debugMode']
-                    if 'userSettings' in settingsDict:
-                        cls.userSettings = settingsDict['userSettings']
-                    if 'userScripts' in settingsDict:
-                        cls.userScripts = settingsDict['userScripts']
-                    if 'recentFiles' in settingsDict:
-                        cls.recentFiles = settingsDict['recentFiles']
+                    settingsDict = json.load( settingsFile )
+                    cls.ramsesClientPath = settingsDict.get( 'clientPath', cls.ramsesClientPath )
+                    cls.ramsesClientPort = settingsDict.get( 'clientPort', cls.ramsesClientPort )
+                    cls.logLevel = settingsDict.get( 'logLevel', cls.logLevel )
+                    cls.autoIncrementTimeout = settingsDict.get( 'autoIncrementTimeout', cls.autoIncrementTimeout )
+                    cls.debugMode = settingsDict.get( 'debugMode', cls.debugMode )
+                    cls.userSettings = settingsDict.get( 'userSettings', cls.userSettings )
+                    cls.userScripts = settingsDict.get( 'userScripts', cls.userScripts )
+                    cls.recentFiles = settingsDict.get( 'recentFiles', cls.recentFiles )
 
         return cls._instance
 
@@ -141,9 +132,13 @@ class RamSettings( object ):
         }
 
         if self._filePath == '':
-            raise ("Invalid path for the settings, I can't save them, sorry.")
-
-        with open(self._filePath, 'w', encoding="utf8") as settingsFile:
-            settingsFile.write( json.dumps( settingsDict, indent=4 ) )
+            raise RuntimeError("Invalid path for the settings, I can't save them, sorry.")
+
+        # Write to a temporary file first, and replace the settings at once:
+        # the previous settings are kept if anything goes wrong while writing
+        tempFilePath = self._filePath + '.tmp'
+        with open(tempFilePath, 'w', encoding="utf8") as settingsFile:
+            json.dump( settingsDict, settingsFile, indent=4 )
+        os.replace( tempFilePath, self._filePath )
 
         log("Settings saved!")
@@ -31,6 +31,8 @@ DAEMON = RamDaemonInterface.instance()
 class RamShot( RamItem ):
     """A shot"""
 
+    __slots__ = ()
+
     @staticmethod
     def fromPath( fileOrFolderPath, virtualIfNotFound=False ):
         """Returns a RamShot instance built using the given path.
@@ -76,11 +78,15 @@ class RamShot( RamItem ):
         """
 
         duration = self.duration()
+        framerate = self._cached( 'framerate', self.__getFramerate )
+        return int(duration * framerate)
+
+    def __getFramerate(self):
+        """Private method to get the framerate of the project"""
         project = self.project()
-        fps = 24.0
         if project:
-            fps = project.framerate()
-        return int(duration * fps)
+            return project.framerate()
+        return 24.0
 
     def sequence(self):
         """The sequence containing this shot"""
@@ -22,6 +22,8 @@ from .ram_object import RamObject
 class RamState( RamObject ):
     """Represents a state used in a status, like “CHK” (To be checked), “OK” (ok), “TO_DO”, etc."""
 
+    __slots__ = ()
+
     @staticmethod
     def stateSorter( s ):
         """Used to sort list of states"""
@@ -28,9 +28,20 @@ from .daemon_interface import RamDaemonInterface
 # Keep the daemon at hand
 DAEMON = RamDaemonInterface.instance()
 
+# The step types as stored in the data
+STEP_TYPES = {
+    "asset": StepType.ASSET_PRODUCTION,
+    "shot": StepType.SHOT_PRODUCTION,
+    "pre": StepType.PRE_PRODUCTION,
+    "post": StepType.POST_PRODUCTION
+}
+
 class RamStep( RamObject ):
     """A step in the production of the shots or assets of the project."""
 
+    # Projects have lots of steps, and the pipes list them too
+    __slots__ = ( '__project', )
+
     # project is undocumented and used to improve performance, when called from a RamProject
     @staticmethod
     def fromPath( path ):
@@ -70,33 +81,50 @@ class RamStep( RamObject ):
             uuid (str)
         """
         super(RamStep, self).__init__( uuid, data, create, "RamStep" )
+        self.__project = None
 
-    def inputPipes( self ):
-        """The pipes coming to this step"""
+    def _pipes( self ):
+        """Low-level, undocumented. The pipes of the project.
+        Kept like the data, as the input and output pipes are usually needed together.
+
+        Returns: list of RamPipe or None if there's no project
+        """
+        return self._cached( 'pipes', self.__getPipes )
+
+    def __getPipes( self ):
+        """Private method to get the pipes from the project"""
         project = self.project()
         if project is None:
+            return None
+        return project.pipes()
+
+    def inputPipes( self ):
+        """The pipes coming to this step"""
+        pipes = self._pipes()
+        if pipes is None:
             return ()
 
         inputPipes = []
-        pipes = project.pipes()
+        # Compare the uuids, don't build a step for each pipe
+        uuid = self.uuid()
 
         for pipe in pipes:
-            if pipe.inputStep() == self:
+            if pipe.inputStepUuid() == uuid:
                 inputPipes.append(pipe)
 
         return inputPipes
 
     def outputPipes( self ):
         """The pipes going out of this step"""
-        project = self.project()
-        if project is None:
+        pipes = self._pipes()
+        if pipes is None:
             return ()
 
         outputPipes = []
-        pipes = project.pipes()
+        uuid = self.uuid()
 
         for pipe in pipes:
-            if pipe.outputStep() == self:
+            if pipe.outputStepUuid() == uuid:
                 outputPipes.append(pipe)
 
         return outputPipes
@@ -107,8 +135,6 @@ class RamStep( RamObject ):
             str
         """
 
-        templatesFolder = ""
-
         stepFolder = self.folderPath()
 
         if stepFolder == '':
@@ -119,8 +145,10 @@ class RamStep( RamObject ):
             FolderNames.stepTemplates
         ))
 
+        # Checking first is a single stat when the folder exists, makedirs alone would stat it twice;
+        # but another process may create it in between
         if not os.path.isdir(templatesFolder):
-            os.makedirs(templatesFolder)
+            os.makedirs(templatesFolder, exist_ok=True)
 
         return templatesFolder
 
@@ -136,7 +164,7 @@ class RamStep( RamObject ):
         ))
 
         if not os.path.isdir(folder):
-            os.makedirs(folder)
+            os.makedirs(folder, exist_ok=True)
 
         return folder
 
@@ -145,11 +173,20 @@ class RamStep( RamObject ):
         templatesPublishPath = self.templatesPublishPath()
 
         versionFolders = []
+        # The step may not have a folder
+        if templatesPublishPath == '':
+            return versionFolders
+
+        folderPrefix = templatesPublishPath if templatesPublishPath.endswith('/') else templatesPublishPath + '/'
 
-        for f in os.listdir(templatesPublishPath):
-            folderPath = RamFileManager.buildPath(( templatesPublishPath, f ))
-            if not os.path.isdir(folderPath): continue
-            versionFolders.append( folderPath )
+        # The entries know their type, no need to stat each of them
+        try:
+            with os.scandir(templatesPublishPath) as entries:
+                for entry in entries:
+                    if not entry.is_dir(): continue
+                    versionFolders.append( folderPrefix + entry.name )
+        except ( FileNotFoundError, NotADirectoryError ):
+            return versionFolders
 
         versionFolders.sort(key=RamFileManager._publishVersionFoldersSorter)
 
@@ -163,21 +200,21 @@ class RamStep( RamObject ):
             enumerated value
         """
 
-        stepType = self.get("type", "asset")
-        if stepType == "asset":
-            return StepType.ASSET_PRODUCTION
-        elif stepType == "shot":
-            return StepType.SHOT_PRODUCTION
-        elif stepType == "pre":
-            return StepType.PRE_PRODUCTION
-        elif stepType == "post":
-            return StepType.POST_PRODUCTION
-        return StepType.ALL
+        return STEP_TYPES.get( self.get("type", "asset"), StepType.ALL )
 
     def project(self): # Immutable
         """Returns the project this step belongs to"""
+        # The project can't change, keep the same instance (and its cached data)
+        if self.__project is not None:
+            return self.__project
+
         from .ram_project import RamProject
-        return RamProject( self.get("project", ""))
+
+        projectUuid = self.get("project", "")
+        project = RamProject( projectUuid )
+        if projectUuid != "":
+            self.__project = project
+        return project
 
     def projectShortName(self):
         """Returns the short name of the step this item belongs to"""
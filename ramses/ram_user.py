@@ -27,6 +27,8 @@ SETTINGS = RamSettings.instance()
 class RamUser( RamObject ):
     """The class representing users."""
 
+    __slots__ = ()
+
     def __init__( self, uuid="", data = None, create=False ):
         """
         Args:
@@ -177,9 +177,13 @@ class Ramses( object ):
 
         # Check if already online
         self._offline = False
+        # The user or the client may have changed since the last ping
+        DAEMON._clearPing()
         if DAEMON.online():
             user = self.currentUser()
             if user:
+                # The states are available now, they're needed to parse file names
+                RamFileInfo.invalidateRegExCache()
                 return True
             else:
                 DAEMON.raiseWindow()
@@ -277,6 +281,8 @@ class Ramses( object ):
             log("The Client can't be launched correctly.", LogLevel.Critical)
             return False
 
+        # Ping the new client on the next query
+        DAEMON._clearPing()
         return True
 
     def settings(self):
@@ -40,9 +40,7 @@ def escapeRegEx( string ):
 def intToStr( i, numDigits=3):
     """Converts an int to a string, prepending zeroes"""
     intStr = str(i)
-    while len(intStr) < numDigits:
-        intStr = '0' + intStr
-    return intStr
+    return '0' * ( numDigits - len(intStr) ) + intStr
 
 def removeDuplicateObjectsFromList( l ):
     """Removes duplcates from a list"""
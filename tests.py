@@ -1,5 +1,7 @@
-import os
+import os, json, tempfile
 from ramses.file_info import RamFileInfo
+from ramses.utils import intToStr
+from pathlib import Path
 # from time import perf_counter
 from ramses import (
     log,
@@ -17,6 +19,8 @@ from ramses import (
     RamPipeFile,
     ItemType,
     RamDaemonInterface,
+    RamProject,
+    RamShot,
     StepType
     )
 
@@ -192,6 +196,147 @@ def metaDataManager():
     print('Version is: ' + str(version))
     print('State is: ' + state)
 
+def resources():
+    # The forbidden characters in the resources
+    assert RamFileManager._fixResourceStr('Main_Res[1].v2/a,b') == 'Main-Res-1--v2-a b'
+    assert RamFileManager._fixResourceStr('Nothing to fix') == 'Nothing to fix'
+    print("Resources OK")
+
+def versionPrefixes():
+    # A version prefix is not a regex, it may contain '+'
+    settings.versionPrefixes.append('w+p')
+    RamFileInfo.invalidateRegExCache()
+    try:
+        nm = RamFileInfo()
+        assert nm.setFileName( 'PROJ_A_TRI_MOD_w+p002.ma' )
+        assert nm.state == 'w+p' and nm.version == 2
+        # Not a version: it's a resource
+        nm = RamFileInfo()
+        assert nm.setFileName( 'PROJ_A_TRI_MOD_wwp002.ma' )
+        assert nm.resource == 'wwp002' and nm.version == -1
+    finally:
+        settings.versionPrefixes.remove('w+p')
+        RamFileInfo.invalidateRegExCache()
+    print("Version prefixes OK")
+
+def paddedNumbers():
+    assert intToStr(5) == '005'
+    assert intToStr(0) == '000'
+    assert intToStr(12, 2) == '12'
+    assert intToStr(1234) == '1234'
+    print("Padded numbers OK")
+
+def pathLikeNames():
+    nm = RamFileInfo()
+    nm.setFilePath( Path('/tmp/PROJ_A_TRI_MOD_v005.blend') )
+    assert nm.shortName == 'TRI' and nm.version == 5
+
+    nm = RamFileInfo()
+    nm.setFilePath( b'/tmp/PROJ_A_TRI_MOD_v005.blend' )
+    assert nm.shortName == 'TRI' and nm.version == 5
+    # Not a path: nothing is parsed, and nothing is raised
+    assert not RamFileInfo().setFileName( 5 )
+    print("Path-like names OK")
+
+def projectFolders():
+    with tempfile.TemporaryDirectory() as folder:
+        assert not RamFileManager.isProjectFolder( folder )
+        os.makedirs( folder + '/' + settings.folderNames.admin )
+        # The result is kept for a few seconds
+        assert not RamFileManager.isProjectFolder( folder )
+        RamFileManager.clearProjectFoldersCache()
+        assert RamFileManager.isProjectFolder( folder )
+    print("Project folders OK")
+
+def fileNames():
+    # The names must be parsed and built back the same way
+    names = (
+        ('PROJ_A_TRI_MOD_Main Res_v012.blend', ('PROJ', 'A', 'TRI', 'MOD', 'Main Res', 'v', 12, 'blend')),
+        ('PROJ_G_TEX_Template.mb', ('PROJ', 'G', 'Template', 'TEX', '', '', -1, 'mb')),
+        ('PROJ_S_010_ANIM_pub002.ma', ('PROJ', 'S', '010', 'ANIM', '', 'pub', 2, 'ma')),
+        ('PROJ_A_TRI_MOD_v005.blend', ('PROJ', 'A', 'TRI', 'MOD', '', 'v', 5, 'blend')),
+    )
+    for name, expected in names:
+        nm = RamFileInfo()
+        assert nm.setFileName( name ), name
+        result = ( nm.project, nm.ramType, nm.shortName, nm.step, nm.resource, nm.state, nm.version, nm.extension )
+        assert result == expected, name + ': ' + str(result)
+        assert nm.fileName() == name, nm.fileName()
+        print(name + " OK")
+
+    # A version block can't be the short name or the step, and a version must be a block of its own
+    for name in ( 'PROJ_A_v005.blend', 'PROJ_A_TRI_MOD_v5res.blend', 'notramses.txt' ):
+        assert not RamFileInfo().setFileName( name ), name
+
+def folderListings():
+    with tempfile.TemporaryDirectory() as folder:
+        source = folder + '/PROJ_A_TRI_MOD.blend'
+        open( source, 'w' ).close()
+        versionsFolder = folder + '/_versions'
+        os.makedirs( versionsFolder )
+        assert RamFileManager._listRamsesFiles( versionsFolder + '/' ) == []
+        # Writing a file drops the kept listing of its folder, even when the folder is given another way
+        RamFileManager.copy( source, versionsFolder + '/PROJ_A_TRI_MOD_v001.blend', False )
+        assert len( RamFileManager._listRamsesFiles( versionsFolder + '/' ) ) == 1
+    print("Folder listings OK")
+
+def shotsFilter():
+    # Virtual shots, to not depend on the project in the daemon
+    testShots = [
+        RamShot( data={ 'name': 'Shot 010', 'shortName': 'SH010' } ),
+        RamShot( data={ 'name': 'Shot 020', 'shortName': 'SH020' } ),
+        RamShot( data={ 'name': 'Intro', 'shortName': 'IN010' } ),
+    ]
+    daemon.getShots = lambda projectUuid, sequenceUuid="": list( testShots )
+    try:
+        proj = RamProject( data={ 'name': 'Test', 'shortName': 'TEST' } )
+        assert len( proj.shots() ) == 3
+        assert len( proj.shots("*") ) == 3
+        assert [ s.shortName() for s in proj.shots("0") ] == [ 'SH010', 'SH020' ]
+        assert [ s.shortName() for s in proj.shots("S*0*0") ] == [ 'SH010', 'SH020' ]
+        assert [ s.shortName() for s in proj.shots("*1*") ] == [ 'SH010' ]
+        # The dots are not regex wildcards
+        assert proj.shots("S.*") == []
+    finally:
+        del daemon.getShots
+    print("Shots filter OK")
+
+def settingsSave():
+    with tempfile.TemporaryDirectory() as folder:
+        settings._filePath = folder + '/ramses_addons_settings.json'
+        try:
+            settings.save()
+            with open( settings._filePath, 'r', encoding="utf8" ) as settingsFile:
+                settingsDict = json.load( settingsFile )
+            assert settingsDict['clientPort'] == settings.ramsesClientPort
+            # The temporary file has replaced the settings
+            assert os.listdir( folder ) == [ 'ramses_addons_settings.json' ]
+
+            settings._filePath = ''
+            try:
+                settings.save()
+                assert False, "Saving without a path must fail"
+            except RuntimeError:
+                pass
+        finally:
+            del settings._filePath
+    print("Settings OK")
+
+def cachedValues():
+    o = RamObject( data={ 'name': 'Object Name', 'shortName': 'ID' } )
+    computed = []
+    def compute():
+        computed.append( o.shortName() )
+        return o.shortName()
+    assert o._cached( 'test', compute ) == 'ID'
+    assert o._cached( 'test', compute ) == 'ID'
+    assert len( computed ) == 1
+    # The values computed from the old data are forgotten
+    o.set( 'shortName', 'NEW' )
+    assert o._cached( 'test', compute ) == 'NEW'
+    assert len( computed ) == 2
+    print("Cached values OK")
+
 # === TESTS ===
 
 # ramObjects()
@@ -206,6 +351,16 @@ def metaDataManager():
 # fileManager()
 # metaDataManager()
 # ramStep()
+# resources()
+# versionPrefixes()
+# paddedNumbers()
+# pathLikeNames()
+# projectFolders()
+# fileNames()
+# folderListings()
+# shotsFilter()
+# settingsSave()
+# cachedValues()
 
 proj = ramses.currentProject()
 assets = proj.assets()